@@ -10,6 +10,20 @@ A good logfile has simulations that each has
 
 
 import argparse
+import functools
+import os
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import pairwise
+
+import numpy
+
+try:
+    import numba
+except ImportError:
+    numba = None
 
 
 def read_logfile(logfile):
@@ -19,62 +33,233 @@ def read_logfile(logfile):
         logfile (str): path to the F@H logfile.
 
     Returns:
-        A dict mapping simulation_id's to their corresponding timestamps. A simulation_id
-        follows the {project_number}:{run_number}:{clone_number} format. For example:
+        A dict mapping simulation_id's to their corresponding timestamps, stored as
+        packed int64 array.array('q') sequences. A simulation_id is a
+        (project_number, run_number, clone_number) tuple of ints. For example:
 
             {
-                '1797:0:0': [0, 100, 200, ..., 12000],
-                '1797:0:1': [0, 100, 200, ..., 12000],
+                (1797, 0, 0): array('q', [0, 100, 200, ..., 12000]),
+                (1797, 0, 1): array('q', [0, 100, 200, ..., 12000]),
                 ...
             }
     """
-    logfile_data = {}
+    logfile_data = defaultdict(lambda: array('q'))
     logfile_handle = open(logfile, "r")
 
     for line in logfile_handle:
-        (project_number, run_number, clone_number, timestamp_in_ps) = line.split()[0:4]
-        simulation_id = f"{project_number}:{run_number}:{clone_number}"
-        if simulation_id not in logfile_data.keys() or logfile_data[simulation_id] is None:
-            logfile_data[simulation_id] = [int(timestamp_in_ps)]
-        else:
-            logfile_data[simulation_id].append(int(timestamp_in_ps))
+        (project_number, run_number, clone_number, timestamp_in_ps) = line.split(None, 3)
+        simulation_id = (int(project_number), int(run_number), int(clone_number))
+        logfile_data[simulation_id].append(int(timestamp_in_ps))
 
     logfile_handle.close()
     return logfile_data
 
 
-def check(logfile):
+def check(logfile, processes=1, low_memory=False):
     """Check for missing, duplicate, and non-thousands-ending timestamps.
 
     Args:
         logfile(str): path to the F@H logfile.
+        processes(int): number of worker processes for the per-simulation
+                        checks; values below 2 keep everything in-process.
+        low_memory(bool): stream the logfile with O(1) state per simulation
+                          instead of bulk-loading it, re-reading it only for
+                          simulations that need their full timestamp list.
 
     Returns:
         A dict maps from simulation_id's to their corresponding SimCheckResult instances.
-        A simulation_id follows the {project_number}:{run_number}:{clone_number} format.
+        A simulation_id is a (project_number, run_number, clone_number) tuple of ints.
         For example:
             {
-                '1797:0:0': <an instance of SimCheckResult>,
-                '1797:0:1': <an instance of SimCheckResult>
+                (1797, 0, 0): <an instance of SimCheckResult>,
+                (1797, 0, 1): <an instance of SimCheckResult>
                 ...
             }
     """
-    logfile_data = read_logfile(logfile)
-    check_result = {}
+    if low_memory:
+        return _check_streaming(logfile)
+
+    records = numpy.loadtxt(logfile, dtype=numpy.int64, usecols=(0, 1, 2, 3), ndmin=2)
+    if records.size == 0:
+        return {}
+
+    order = numpy.lexsort((records[:, 2], records[:, 1], records[:, 0]))
+    records = records[order]
+    simulation_ids = records[:, :3]
+    timestamps = records[:, 3]
+
+    boundaries = numpy.flatnonzero(
+        (simulation_ids[1:] != simulation_ids[:-1]).any(axis=1)) + 1
+    starts = numpy.concatenate(([0], boundaries))
+    ends = numpy.concatenate((boundaries, [len(records)]))
+
+    sim_id_tuples = [(int(simulation_ids[start][0]),
+                      int(simulation_ids[start][1]),
+                      int(simulation_ids[start][2]))
+                     for start in starts]
+    sim_timestamps = [timestamps[start:end] for start, end in zip(starts, ends)]
+
+    if processes is not None and processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            sim_check_results = list(
+                executor.map(check_timestamps, sim_timestamps, chunksize=64))
+    else:
+        sim_check_results = [check_timestamps(timestamps)
+                             for timestamps in sim_timestamps]
+
+    group_max_timestamps = numpy.maximum.reduceat(timestamps, starts)
+    are_in_thousands = group_max_timestamps % 1000 == 0
+    for sim_check_result, max_timestamp, in_thousands in zip(
+            sim_check_results, group_max_timestamps, are_in_thousands):
+        sim_check_result.last_timestamp = int(max_timestamp)
+        sim_check_result.is_last_ts_in_thousands = bool(in_thousands)
+
+    return dict(zip(sim_id_tuples, sim_check_results))
+
+
+def _scan_timestamps(timestamps):
+    """Single-pass step/min/max kernel behind check_timestamps.
+
+    Compiled to machine code by numba when it is available; check_timestamps
+    falls back to the equivalent vectorized numpy expressions otherwise.
+
+    Args:
+        timestamps (numpy.ndarray): int64 timestamps (ps) of one simulation,
+                                    in logfile order.
+
+    Returns:
+        A (has_correct_steps, min_timestamp, max_timestamp) tuple.
+    """
+    min_timestamp = timestamps[0]
+    max_timestamp = timestamps[0]
+    has_correct_steps = True
+    for i in range(1, timestamps.size):
+        if timestamps[i - 1] + 100 != timestamps[i]:
+            has_correct_steps = False
+        if timestamps[i] < min_timestamp:
+            min_timestamp = timestamps[i]
+        elif timestamps[i] > max_timestamp:
+            max_timestamp = timestamps[i]
+    return has_correct_steps, min_timestamp, max_timestamp
+
+
+if numba is not None:
+    _scan_timestamps = numba.njit(cache=True)(_scan_timestamps)
+
+
+def check_timestamps(timestamps):
+    """Check one simulation's timestamps for missing and duplicate values.
+
+    Args:
+        timestamps (numpy.ndarray): int64 timestamps (ps) of one simulation,
+                                    in logfile order.
+
+    Returns:
+        A SimCheckResult with the missing/duplicate fields filled in. The
+        last-timestamp fields are left for the caller: check() derives them
+        for every simulation at once with a single batched reduction.
+    """
+    sim_check_result = SimCheckResult()
+
+    if numba is not None:
+        has_correct_steps, min_timestamp, _ = _scan_timestamps(timestamps)
+        min_timestamp = int(min_timestamp)
+    else:
+        has_correct_steps = bool((numpy.diff(timestamps) == 100).all())
+        min_timestamp = int(timestamps.min())
 
-    for simulation_id, timestamps in logfile_data.items():
-        sim_check_result = SimCheckResult()
+    if has_correct_steps and min_timestamp == 0:
+        # Strict 100ps steps from 0 rule out missing and duplicate
+        # timestamps, so the common clean simulation needs no more scans.
+        if timestamps.size >= 2:
+            sim_check_result.duplicate_timestamps = []
+        return sim_check_result
 
-        if not is_strictly_increasing(timestamps) or min(timestamps) != 0:
-            sim_check_result.missing_timestamps = find_missing_timestamps(
-                timestamps)
+    sim_check_result.missing_timestamps = find_missing_timestamps(timestamps)
 
-        sim_check_result.duplicate_timestamps = find_duplicate_timestamps(
-            timestamps)
-        sim_check_result.is_last_ts_in_thousands = is_last_ts_in_thousands(
-            timestamps)
-        sim_check_result.last_timestamp = max(timestamps)
+    if timestamps.size >= 2:
+        unique_timestamps, counts = numpy.unique(timestamps, return_counts=True)
+        sim_check_result.duplicate_timestamps = (
+            unique_timestamps[counts > 1].tolist())
 
+    return sim_check_result
+
+
+def _check_streaming(logfile):
+    """Two-phase streaming backend for check(low_memory=True).
+
+    The first pass keeps only O(1) running state per simulation (count,
+    endpoints, min/max, strictly-increasing flag), which settles every check
+    except missing/duplicate reconstruction for out-of-order simulations.
+    Only for those is the file read a second time to collect full timestamp
+    lists, so resident memory stays proportional to the number of
+    simulations rather than the number of timestamps.
+
+    Args:
+        logfile (str): path to the F@H logfile.
+
+    Returns:
+        The same dict of SimCheckResult instances as check().
+    """
+    scan_stats = {}
+    logfile_handle = open(logfile, "r")
+
+    for line in logfile_handle:
+        (project_number, run_number, clone_number, timestamp_in_ps) = line.split(None, 3)
+        simulation_id = (int(project_number), int(run_number), int(clone_number))
+        timestamp = int(timestamp_in_ps)
+
+        stats = scan_stats.get(simulation_id)
+        if stats is None:
+            scan_stats[simulation_id] = _SimScanStats(
+                count=1,
+                previous_timestamp=timestamp,
+                min_timestamp=timestamp,
+                max_timestamp=timestamp)
+        else:
+            if stats.previous_timestamp + 100 != timestamp:
+                stats.is_strictly_increasing = False
+            if timestamp < stats.min_timestamp:
+                stats.min_timestamp = timestamp
+            elif timestamp > stats.max_timestamp:
+                stats.max_timestamp = timestamp
+            stats.previous_timestamp = timestamp
+            stats.count += 1
+
+    logfile_handle.close()
+
+    suspect_timestamps = {
+        simulation_id: array('q')
+        for simulation_id, stats in scan_stats.items()
+        if not stats.is_strictly_increasing}
+    if suspect_timestamps:
+        logfile_handle = open(logfile, "r")
+        for line in logfile_handle:
+            (project_number, run_number, clone_number, timestamp_in_ps) = \
+                line.split(None, 3)
+            simulation_id = (int(project_number), int(run_number), int(clone_number))
+            timestamps = suspect_timestamps.get(simulation_id)
+            if timestamps is not None:
+                timestamps.append(int(timestamp_in_ps))
+        logfile_handle.close()
+
+    check_result = {}
+    for simulation_id, stats in scan_stats.items():
+        if simulation_id in suspect_timestamps:
+            sim_check_result = check_timestamps(numpy.frombuffer(
+                suspect_timestamps[simulation_id], dtype=numpy.int64))
+        else:
+            # Strict 100ps steps leave at most a truncated head [0, min)
+            # missing and rule out duplicates, so no second read is needed.
+            sim_check_result = SimCheckResult()
+            if stats.min_timestamp != 0:
+                sim_check_result.missing_timestamps = list(
+                    range(0, stats.min_timestamp, 100))
+            if stats.count >= 2:
+                sim_check_result.duplicate_timestamps = []
+
+        sim_check_result.is_last_ts_in_thousands = stats.max_timestamp % 1000 == 0
+        sim_check_result.last_timestamp = stats.max_timestamp
         check_result[simulation_id] = sim_check_result
 
     return check_result
@@ -95,15 +280,18 @@ def find_missing_timestamps(timestamps):
     if timestamps is None or len(timestamps) == 0:
         return None
 
-    min_correct_timestamp = timestamps[0] if timestamps[0] == 0 else 0
-    max_correct_timestamp = timestamps[-1]
-    correct_time_values_in_ps = (
-        set(range(min_correct_timestamp,
-                  max_correct_timestamp,
-                  100))
-    )
-    missing_timestamps = correct_time_values_in_ps.difference(timestamps)
-    return sorted(missing_timestamps)
+    max_correct_timestamp = int(timestamps[-1])
+    if max_correct_timestamp <= 0:
+        return []
+
+    timestamps = numpy.asarray(timestamps, dtype=numpy.int64)
+    slot_count = -(-max_correct_timestamp // 100)
+    present = numpy.zeros(slot_count, dtype=bool)
+    on_grid_timestamps = timestamps[(timestamps >= 0)
+                                    & (timestamps < max_correct_timestamp)
+                                    & (timestamps % 100 == 0)]
+    present[on_grid_timestamps // 100] = True
+    return (numpy.flatnonzero(~present) * 100).tolist()
 
 
 def find_duplicate_timestamps(timestamps):
@@ -118,9 +306,9 @@ def find_duplicate_timestamps(timestamps):
     if timestamps is None or len(timestamps) < 2:
         return None
 
-    duplicate_timestamps = set(timestamp for timestamp in timestamps
-                               if timestamps.count(timestamp) > 1)
-    return sorted(duplicate_timestamps)
+    timestamp_counts = Counter(timestamps)
+    return sorted(timestamp for timestamp, count in timestamp_counts.items()
+                  if count > 1)
 
 
 def is_strictly_increasing(timestamps):
@@ -136,10 +324,16 @@ def is_strictly_increasing(timestamps):
         True if the timestamps fit the "strictly increasing" definition above,
         False otherwise.
     """
-    if timestamps is None or len(timestamps) == 0:
+    if timestamps is None or len(timestamps) < 2:
         return True
 
-    return all(x < y and x + 100 == y for x, y in zip(timestamps, timestamps[1:]))
+    # Short sequences are not worth an ndarray conversion; pairwise walks
+    # them without copying the way zip(timestamps, timestamps[1:]) would.
+    if len(timestamps) < 1024:
+        return all(x + 100 == y for x, y in pairwise(timestamps))
+
+    timestamps = numpy.asarray(timestamps, dtype=numpy.int64)
+    return bool((numpy.diff(timestamps) == 100).all())
 
 
 def is_last_ts_in_thousands(timestamps):
@@ -163,53 +357,57 @@ def print_to_file(check_result, outfile):
 
     Args:
         check_result (dict): a dict maps from simulation_id's to their corresponding
-                             SimCheckResult instances. A simulation_id follows the
-                             {project_number}:{run_number}:{clone_number} format.
+                             SimCheckResult instances. A simulation_id is a
+                             (project_number, run_number, clone_number) tuple of ints.
         outfile (str): path to the outfile.
     """
-    outfile_handle = open(outfile, 'w+')
+    chunks = []
     for simulation_id, sim_check_result in check_result.items():
         formatted_simulation_id = format_simulation_id(simulation_id)
-        outfile_handle.write(formatted_simulation_id + "\n")
+        chunks.append(formatted_simulation_id)
+        chunks.append("\n")
 
         if ((sim_check_result.missing_timestamps is None or
              len(sim_check_result.missing_timestamps) == 0) and
                 (sim_check_result.duplicate_timestamps is None or
                  len(sim_check_result.duplicate_timestamps) == 0) and
                 sim_check_result.is_last_ts_in_thousands):
-            outfile_handle.write('\tNo issues found\n')
+            chunks.append('\tNo issues found\n')
             continue
 
         if (sim_check_result.missing_timestamps is not None and
                 len(sim_check_result.missing_timestamps) > 0):
-            outfile_handle.write('\tMissing timestamps: ')
-            outfile_handle.write(
+            chunks.append('\tMissing timestamps: ')
+            chunks.append(
                 ", ".join(str(missing_ts)
                           for missing_ts in sim_check_result.missing_timestamps)
                 + "\n")
 
         if (sim_check_result.duplicate_timestamps is not None and
                 len(sim_check_result.duplicate_timestamps) > 0):
-            outfile_handle.write('\tDuplicate timestamps: ')
-            outfile_handle.write(
+            chunks.append('\tDuplicate timestamps: ')
+            chunks.append(
                 ", ".join(str(duplicate_ts)
                           for duplicate_ts in sim_check_result.duplicate_timestamps)
                 + "\n")
 
         if not sim_check_result.is_last_ts_in_thousands:
-            outfile_handle.write(
+            chunks.append(
                 f"\tLast timestamp ({sim_check_result.last_timestamp}ps) is not in thousands\n"
             )
 
-    outfile_handle.close()
+    outfile_fd = os.open(outfile, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    os.write(outfile_fd, "".join(chunks).encode())
+    os.close(outfile_fd)
 
 
+@functools.lru_cache(maxsize=None)
 def format_simulation_id(simulation_id):
     """Convert simulation_id into a more informative format.
 
     Args:
-        simulation_id (str): simulation id in the
-                             {project_number}:{run_number}:{clone_number} format.
+        simulation_id (tuple): simulation id as a
+                               (project_number, run_number, clone_number) tuple.
 
     Returns:
         Simulation id in the PROJ{project_number}/RUN{run_number}/CLONE{clone_number} format.
@@ -217,10 +415,31 @@ def format_simulation_id(simulation_id):
     if not simulation_id:
         return
 
-    (project_number, run_number, clone_number) = simulation_id.split(':')
+    (project_number, run_number, clone_number) = simulation_id
     return f"PROJ{project_number}/RUN{run_number}/CLONE{clone_number}"
 
 
+@dataclass(slots=True)
+class _SimScanStats:
+    """First-pass running state for one simulation in the low-memory scan.
+
+    Attributes:
+        count (int): number of timestamps read for the simulation.
+        previous_timestamp (int): the most recently read timestamp (ps).
+        min_timestamp (int): the smallest timestamp (ps) read so far.
+        max_timestamp (int): the largest timestamp (ps) read so far.
+        is_strictly_increasing (bool): True while every timestamp read so far
+                                       is 100ps after the one before it.
+    """
+
+    count: int = 0
+    previous_timestamp: int = None
+    min_timestamp: int = None
+    max_timestamp: int = None
+    is_strictly_increasing: bool = True
+
+
+@dataclass(slots=True)
 class SimCheckResult:
     """Check result for a simulation.
 
@@ -232,13 +451,10 @@ class SimCheckResult:
         last_timestamp (int): the last timestamp (ps) in the simulation.
     """
 
-    def __init__(self):
-        """Instantiate an object with default values for the attributes."""
-        self.missing_timestamps = None
-        self.duplicate_timestamps = None
-        self.is_last_ts_in_thousands = False
-        self.simulation_id = ''
-        self.last_timestamp = None
+    missing_timestamps: list = None
+    duplicate_timestamps: list = None
+    is_last_ts_in_thousands: bool = False
+    last_timestamp: int = None
 
 
 if __name__ == '__main__':
@@ -246,7 +462,12 @@ if __name__ == '__main__':
         prog='logfile_check', description=__doc__)
     ARGPARSE.add_argument('logfile', help='input logfile')
     ARGPARSE.add_argument('outfile', help='outfile')
+    ARGPARSE.add_argument('--processes', type=int, default=1,
+                          help='number of worker processes for the checks')
+    ARGPARSE.add_argument('--low-memory', action='store_true',
+                          help='stream the logfile instead of bulk-loading it')
 
     ARGS = ARGPARSE.parse_args()
-    CHECK_RESULT = check(ARGS.logfile)
+    CHECK_RESULT = check(ARGS.logfile, processes=ARGS.processes,
+                         low_memory=ARGS.low_memory)
     print_to_file(CHECK_RESULT, ARGS.outfile)
@@ -80,6 +80,14 @@ def test_find_missing_timestamps_7():
     missing_timestamps = logfile_check.find_missing_timestamps([])
     assert missing_timestamps is None
 
+def test_find_missing_timestamps_8():
+    """Timestamp 200 should be detected as missing even though the
+    duplicate of 100 makes the list length look complete.
+    """
+    missing_timestamps = logfile_check.find_missing_timestamps(
+        [0, 100, 100, 300])
+    assert missing_timestamps == [200]
+
 def test_find_dup_timestamps_1():
     """An empty sequence (None) should have no duplicate."""
     assert logfile_check.find_duplicate_timestamps(None) is None
@@ -120,3 +128,61 @@ def test_last_ts_in_thousands_3():
 def test_last_ts_in_thousands_4():
     """This check should return False."""
     assert not logfile_check.is_last_ts_in_thousands([1100, 1200])
+
+
+def test_check_1(tmp_path):
+    """Checking a clean logfile should report no issues."""
+    logfile = tmp_path / "logfile"
+    logfile.write_text("".join(f"1797 0 0 {timestamp}\n"
+                               for timestamp in range(0, 1100, 100)))
+    check_result = logfile_check.check(str(logfile))
+    sim_check_result = check_result[(1797, 0, 0)]
+    assert not sim_check_result.missing_timestamps
+    assert not sim_check_result.duplicate_timestamps
+    assert sim_check_result.is_last_ts_in_thousands
+    assert sim_check_result.last_timestamp == 1000
+
+
+def test_check_parallel(tmp_path):
+    """Checking with worker processes should give the same result."""
+    logfile = tmp_path / "logfile"
+    logfile.write_text("".join(f"1797 {run} 0 {timestamp}\n"
+                               for run in range(4)
+                               for timestamp in range(0, 1100, 100)))
+    check_result = logfile_check.check(str(logfile), processes=2)
+    assert len(check_result) == 4
+    for sim_check_result in check_result.values():
+        assert not sim_check_result.missing_timestamps
+        assert not sim_check_result.duplicate_timestamps
+        assert sim_check_result.is_last_ts_in_thousands
+
+
+def test_check_low_memory(tmp_path):
+    """The low-memory streaming mode should match the default mode."""
+    logfile = tmp_path / "logfile"
+    logfile.write_text(
+        "".join(f"1797 0 0 {timestamp}\n"
+                for timestamp in range(0, 1100, 100))
+        + "".join(f"1797 0 1 {timestamp}\n"
+                  for timestamp in [0, 100, 100, 300, 1100])
+        + "".join(f"1797 0 2 {timestamp}\n"
+                  for timestamp in range(300, 1100, 100)))
+    check_result = logfile_check.check(str(logfile))
+    low_memory_result = logfile_check.check(str(logfile), low_memory=True)
+    assert low_memory_result == check_result
+
+
+def test_check_2(tmp_path):
+    """Checking a bad logfile should report the missing and duplicate
+    timestamps and the non-thousands last timestamp.
+    """
+    logfile = tmp_path / "logfile"
+    logfile.write_text("".join(f"1797 0 1 {timestamp}\n"
+                               for timestamp in [0, 100, 100, 300, 1100]))
+    check_result = logfile_check.check(str(logfile))
+    sim_check_result = check_result[(1797, 0, 1)]
+    assert sim_check_result.missing_timestamps == [
+        200, 400, 500, 600, 700, 800, 900, 1000]
+    assert sim_check_result.duplicate_timestamps == [100]
+    assert not sim_check_result.is_last_ts_in_thousands
+    assert sim_check_result.last_timestamp == 1100